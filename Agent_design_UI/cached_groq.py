@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+import httpx
+from groq import AsyncGroq as AsyncGroqClient
+from groq import Groq as GroqClient
+from groq.types.chat import ChatCompletion, ChatCompletionChunk
+from phi.model.groq import Groq
+from phi.model.message import Message
+
+# One pooled, keep-alive connection pool per process, shared by every model instance
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+SHARED_HTTP_CLIENT = httpx.Client(limits=HTTP_LIMITS)
+_shared_async_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_async_http_client() -> httpx.AsyncClient:
+    """Return the process-wide async HTTP client, creating it on first use"""
+    global _shared_async_http_client
+    if _shared_async_http_client is None:
+        _shared_async_http_client = httpx.AsyncClient(limits=HTTP_LIMITS)
+    return _shared_async_http_client
+
+
+class CachedGroq(Groq):
+    """Groq model that reuses a stored completion while the messages and data files are unchanged"""
+
+    data_files: List[str] = []
+    cache_file: str = ".groq_cache.db"
+    # Agents whose data can change without a file to watch should turn caching off
+    cache_responses: bool = True
+    cache_ttl_seconds: int = 7 * 24 * 60 * 60
+    cache_max_entries: int = 1000
+
+    # Clients are built on the shared pools per call rather than stored as fields,
+    # so Agent.deep_copy() (used by the playground) never has to copy an httpx client
+    def get_client(self) -> GroqClient:
+        if self.client:
+            return self.client
+        return GroqClient(**self.get_client_params(), http_client=SHARED_HTTP_CLIENT)
+
+    def get_async_client(self) -> AsyncGroqClient:
+        if self.async_client:
+            return self.async_client
+        return AsyncGroqClient(**self.get_client_params(), http_client=get_shared_async_http_client())
+
+    def _cache_key(self, messages: List[Message], stream: bool = False) -> str:
+        """Hash the request together with the mtimes of the data it was answered from"""
+        payload = json.dumps(
+            {
+                "model": self.id,
+                "request": self.request_kwargs,
+                # Streamed answers are stored as a list of chunks, so they get their own entries
+                "stream": stream,
+                # Only what is sent to the API; Message also carries timestamps and metrics
+                "messages": [self.format_message(m) for m in messages],
+                "data": [os.stat(f).st_mtime if os.path.exists(f) else None for f in self.data_files],
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.cache_file)
+        conn.execute(
+            # Responses are stored as JSON, never pickled, so the cache file cannot smuggle in code
+            "CREATE TABLE IF NOT EXISTS cached_completions (key TEXT PRIMARY KEY, response TEXT, created_at REAL)"
+        )
+        return conn
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        if not self.cache_responses:
+            return None
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT response FROM cached_completions WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.cache_ttl_seconds),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _cache_put(self, key: str, response: str) -> None:
+        if not self.cache_responses:
+            return
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cached_completions (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, now),
+            )
+            # Keep the file bounded: drop expired entries, then all but the newest ones
+            conn.execute("DELETE FROM cached_completions WHERE created_at < ?", (now - self.cache_ttl_seconds,))
+            conn.execute(
+                "DELETE FROM cached_completions WHERE key NOT IN "
+                "(SELECT key FROM cached_completions ORDER BY created_at DESC LIMIT ?)",
+                (self.cache_max_entries,),
+            )
+
+    def invoke(self, messages: List[Message]) -> ChatCompletion:
+        key = self._cache_key(messages)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return ChatCompletion.model_validate_json(cached)
+        response = super().invoke(messages)
+        self._cache_put(key, response.model_dump_json())
+        return response
+
+    async def ainvoke(self, messages: List[Message]) -> ChatCompletion:
+        key = self._cache_key(messages)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return ChatCompletion.model_validate_json(cached)
+        response = await super().ainvoke(messages)
+        self._cache_put(key, response.model_dump_json())
+        return response
+
+    # Streamed replies are cached as the full chunk list and replayed chunk by chunk;
+    # a stream the caller abandons part way is never stored
+    def invoke_stream(self, messages: List[Message]) -> Iterator[ChatCompletionChunk]:
+        key = self._cache_key(messages, stream=True)
+        cached = self._cache_get(key)
+        if cached is not None:
+            for chunk in json.loads(cached):
+                yield ChatCompletionChunk.model_validate(chunk)
+            return
+        chunks = []
+        for chunk in super().invoke_stream(messages):
+            chunks.append(chunk.model_dump(mode="json"))
+            yield chunk
+        self._cache_put(key, json.dumps(chunks))
+
+    async def ainvoke_stream(self, messages: List[Message]) -> AsyncIterator[ChatCompletionChunk]:
+        key = self._cache_key(messages, stream=True)
+        cached = self._cache_get(key)
+        if cached is not None:
+            for chunk in json.loads(cached):
+                yield ChatCompletionChunk.model_validate(chunk)
+            return
+        chunks = []
+        async for chunk in super().ainvoke_stream(messages):
+            chunks.append(chunk.model_dump(mode="json"))
+            yield chunk
+        self._cache_put(key, json.dumps(chunks))
@@ -1,22 +1,44 @@
 import httpx
+import time
 from pathlib import Path
 from phi.agent import Agent
 from phi.tools.csv_tools import CsvTools
-from phi.model.groq import Groq
+from cached_groq import CachedGroq, SHARED_HTTP_CLIENT
 url = "https://phidata-public.s3.amazonaws.com/demo_data/IMDB-Movie-Data.csv"
-response = httpx.get(url)
 
 imdb_csv = Path(__file__).parent.joinpath("wip").joinpath("sample_imdb.csv")
 imdb_csv.parent.mkdir(parents=True, exist_ok=True)
-imdb_csv.write_bytes(response.content)
+# Holds the server ETag; its mtime records when we last checked for a new copy
+imdb_etag = imdb_csv.with_suffix(".etag")
+
+# Re-check at most once a day, and let the server answer 304 if nothing changed
+if not imdb_csv.exists() or not imdb_etag.exists() or time.time() - imdb_etag.stat().st_mtime > 86400:
+    headers = {}
+    saved_etag = imdb_etag.read_text() if imdb_etag.exists() else ""
+    if imdb_csv.exists() and saved_etag:
+        headers["If-None-Match"] = saved_etag
+    try:
+        response = SHARED_HTTP_CLIENT.get(url, headers=headers)
+        if response.status_code == 304:
+            imdb_etag.touch()
+        else:
+            response.raise_for_status()
+            imdb_csv.write_bytes(response.content)
+            imdb_etag.write_text(response.headers.get("etag", ""))
+    except httpx.HTTPError:
+        # A stale local copy beats no copy; only fail when there is nothing to fall back on
+        if not imdb_csv.exists():
+            raise
+        print(f"Could not refresh {imdb_csv.name}, using the cached copy")
 
 agent = Agent(
-    tools=[CsvTools(csvs=[imdb_csv])],
-    model=Groq(id="llama-3.3-70b-versatile"),
+    tools=[CsvTools(csvs=[imdb_csv], read_csvs=False)],
+    model=CachedGroq(id="llama-3.3-70b-versatile", data_files=[str(imdb_csv)]),
     markdown=True,
     show_tool_calls=True,
     instructions=[
         "First always get the list of files",
+        "Read the column names and query the file instead of reading it whole",
     ],
 )
 agent.cli_app(stream=True)
\ No newline at end of file
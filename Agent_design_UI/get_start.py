@@ -7,4 +7,4 @@ agent = Agent(
     model=Groq(id="llama-3.3-70b-versatile"),
     markdown=True
 )
-agent.print_response("Share a 2 sentence horror story.")
\ No newline at end of file
+agent.print_response("Share a 2 sentence horror story.", stream=True)
\ No newline at end of file
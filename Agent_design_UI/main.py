@@ -1,15 +1,69 @@
 import csv
+import functools
+import io
+import itertools
 import json
+import os
+import sqlite3
+import time
+import duckdb
 import httpx
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from phi.model.groq import Groq
+from typing import List, Dict, Any, Optional, Tuple
+from cached_groq import CachedGroq
 from phi.agent import Agent
 from phi.tools.csv_tools import CsvTools
 
+TASK_COLUMNS = [
+    'task_id', 'title', 'description', 'category', 
+    'priority', 'status', 'created_date', 'due_date', 
+    'rollover_count', 'time_block'
+]
+
+# Builds today's progress.csv row straight from the tasks table. The text is
+# constant, so sqlite3's statement cache keeps it prepared between calls.
+PROGRESS_ROW_SQL = """
+SELECT
+    :today, completed, pending, :migrated,
+    ROUND(COALESCE(100.0 * completed / NULLIF(completed + pending, 0), 0), 2), ''
+FROM (
+    SELECT
+        COUNT(*) FILTER (WHERE status = 'completed' AND due_date = :today) AS completed,
+        COUNT(*) FILTER (WHERE status = 'pending' AND due_date = :today) AS pending
+    FROM tasks
+)
+"""
+
+# Bytes read per step when scanning progress.csv backwards
+PROGRESS_READ_BLOCK = 1 << 16
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Your defined time blocks: (start_time, end_time, block_name, block_type)
+DEFAULT_BLOCKS = [
+    ('06:00', '06:50', 'Morning Routine & Mental Warm-Up', 'routine'),
+    ('06:50', '10:00', 'Core Learning Sessions', 'learning'),
+    ('10:30', '14:00', 'Project & Skill Application', 'project'),
+    ('14:00', '15:00', 'Job Search & Networking', 'career'),
+    ('20:30', '21:00', 'Reflection & Planning', 'planning'),
+]
+
+@functools.lru_cache(maxsize=1)
+def _today_strings(minute: int) -> Tuple[str, str]:
+    now = datetime.now()
+    return now.strftime('%Y-%m-%d'), now.strftime('%A')
+
+def _today() -> str:
+    """Today's date as YYYY-MM-DD, formatted at most once a minute"""
+    return _today_strings(int(time.time() // 60))[0]
+
+def _today_name() -> str:
+    """Today's weekday name, formatted at most once a minute"""
+    return _today_strings(int(time.time() // 60))[1]
+
 class PersonalPASystem:
-    def __init__(self, data_dir: str = "pa_data"):
+    def __init__(self, data_dir: str = "pa_data", db_file: str = "agents.db"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
@@ -18,14 +72,35 @@ class PersonalPASystem:
         self.schedule_csv = self.data_dir / "schedule.csv"
         self.progress_csv = self.data_dir / "progress.csv"
         
+        # Tasks live in SQLite so edits touch a single row;
+        # tasks.csv is only an export for the CSV tools
+        self.conn = sqlite3.connect(db_file)
+        self._initialize_tasks_table()
+        
         # Create CSV files if they don't exist
         self._initialize_csv_files()
         
+        # In-process DuckDB with views over the CSVs for our own typed queries
+        self.duck = duckdb.connect()
+        # View DDL cannot take bound parameters, so quote the paths as SQL string literals
+        schedule_path = str(self.schedule_csv).replace("'", "''")
+        progress_path = str(self.progress_csv).replace("'", "''")
+        self.duck.execute(
+            # Keep times and task_ids as the strings the CSV holds (empty task_ids stays '')
+            f"CREATE VIEW schedule AS SELECT * REPLACE (COALESCE(task_ids, '') AS task_ids) "
+            f"FROM read_csv_auto('{schedule_path}', "
+            f"types={{'start_time': 'VARCHAR', 'end_time': 'VARCHAR', 'task_ids': 'VARCHAR'}})"
+        )
+        self.duck.execute(
+            f"CREATE VIEW progress AS SELECT * FROM read_csv_auto('{progress_path}', types={{'date': 'VARCHAR'}})"
+        )
+        
         # Set up the agent with CSV tools
         self.csv_tools = CsvTools(
             csvs=[self.tasks_csv, self.schedule_csv, self.progress_csv],
             row_limit=None,
-            read_csvs=True,
+            # Keep raw CSV dumps out of the prompt; the agent gets a summary instead
+            read_csvs=False,
             list_csvs=True,
             query_csvs=True,
             read_column_names=True
@@ -33,31 +108,64 @@ class PersonalPASystem:
         
         self.agent = Agent(
             tools=[self.csv_tools],
-            model=Groq(id="llama-3.3-70b-versatile"),
+            model=CachedGroq(
+                id="llama-3.3-70b-versatile",
+                data_files=[db_file, str(self.schedule_csv), str(self.progress_csv)]
+            ),
             markdown=True,
             show_tool_calls=True,
             instructions=[
                 "You are a personal PA advisor that helps with task management and scheduling.",
                 "Use the CSV tools to manage tasks, schedule, and track progress.",
+                "The data summary below describes each CSV; query the CSVs only when you need specific rows.",
                 "Always provide actionable insights and recommendations.",
                 "Focus on optimizing productivity and managing task migrations."
             ]
         )
     
+    def _initialize_tasks_table(self):
+        with self.conn:
+            self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT,
+                description TEXT,
+                category TEXT,
+                priority INTEGER,
+                status TEXT NOT NULL DEFAULT 'pending',
+                created_date TEXT,
+                due_date TEXT,
+                rollover_count INTEGER NOT NULL DEFAULT 0,
+                time_block TEXT
+            )
+            """)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks (status, due_date)"
+            )
+            
+            # Carry over tasks from the old CSV store before it becomes an export
+            is_empty = self.conn.execute("SELECT NOT EXISTS (SELECT 1 FROM tasks)").fetchone()[0]
+            if is_empty and self.tasks_csv.exists():
+                with open(self.tasks_csv, 'r', newline='') as file:
+                    rows = [
+                        [row[column] for column in TASK_COLUMNS]
+                        for row in csv.DictReader(file)
+                    ]
+                self.conn.executemany(
+                    f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(TASK_COLUMNS))})",
+                    rows
+                )
+    
     def _initialize_csv_files(self):
         # Initialize tasks.csv
         if not self.tasks_csv.exists():
-            with open(self.tasks_csv, 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow([
-                    'task_id', 'title', 'description', 'category', 
-                    'priority', 'status', 'created_date', 'due_date', 
-                    'rollover_count', 'time_block'
-                ])
+            self.export_tasks_csv()
         
         # Initialize schedule.csv
         if not self.schedule_csv.exists():
-            with open(self.schedule_csv, 'w', newline='') as file:
+            # Large buffer so the whole default schedule goes out in a single write
+            with open(self.schedule_csv, 'w', newline='', buffering=1 << 16) as file:
                 writer = csv.writer(file)
                 writer.writerow([
                     'block_id', 'day', 'start_time', 'end_time', 
@@ -77,127 +185,76 @@ class PersonalPASystem:
                 ])
     
     def _add_default_schedule(self, writer):
-        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        block_id = 1
-        
-        for day in days:
-            # Morning Routine & Mental Warm-Up
-            writer.writerow([
-                block_id, day, '06:00', '06:50', 
-                'Morning Routine & Mental Warm-Up', 'routine', ''
-            ])
-            block_id += 1
-            
-            # Core Learning Sessions
-            writer.writerow([
-                block_id, day, '06:50', '10:00', 
-                'Core Learning Sessions', 'learning', ''
-            ])
-            block_id += 1
-            
-            # Project & Skill Application
-            writer.writerow([
-                block_id, day, '10:30', '14:00', 
-                'Project & Skill Application', 'project', ''
-            ])
-            block_id += 1
-            
-            # Job Search & Networking
-            writer.writerow([
-                block_id, day, '14:00', '15:00', 
-                'Job Search & Networking', 'career', ''
-            ])
-            block_id += 1
-            
-            # Reflection & Planning
-            writer.writerow([
-                block_id, day, '20:30', '21:00', 
-                'Reflection & Planning', 'planning', ''
-            ])
-            block_id += 1
+        # Build all 7 x 5 default blocks up front and write them in one call
+        rows = [
+            [block_id, day, start_time, end_time, block_name, block_type, '']
+            for block_id, (day, (start_time, end_time, block_name, block_type))
+            in enumerate(itertools.product(DAYS, DEFAULT_BLOCKS), start=1)
+        ]
+        writer.writerows(rows)
+    
+    def export_tasks_csv(self) -> None:
+        """Dump the tasks table to tasks.csv for the CSV tools"""
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks ORDER BY task_id"
+        )
+        with open(self.tasks_csv, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(TASK_COLUMNS)
+            writer.writerows(cursor)
     
     def add_task(self, title: str, description: str, category: str, 
                 priority: int, due_date: str, time_block: str) -> None:
         """Add a new task to the system"""
-        # Read existing tasks to get the next task_id
-        with open(self.tasks_csv, 'r', newline='') as file:
-            reader = csv.reader(file)
-            rows = list(reader)
-            
-            # Skip header row and get max task_id
-            if len(rows) > 1:
-                task_ids = [int(row[0]) for row in rows[1:] if row[0].isdigit()]
-                next_id = max(task_ids) + 1 if task_ids else 1
-            else:
-                next_id = 1
-        
-        # Append new task
-        with open(self.tasks_csv, 'a', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow([
-                next_id, title, description, category, 
-                priority, 'pending', datetime.now().strftime('%Y-%m-%d'),
-                due_date, 0, time_block
-            ])
+        with self.conn:
+            cursor = self.conn.execute(
+                """
+                INSERT INTO tasks (title, description, category, priority, status,
+                                   created_date, due_date, rollover_count, time_block)
+                VALUES (?, ?, ?, ?, 'pending', ?, ?, 0, ?)
+                """,
+                (title, description, category, priority,
+                 _today(), due_date, time_block)
+            )
         
-        print(f"Task '{title}' added successfully with ID {next_id}")
+        print(f"Task '{title}' added successfully with ID {cursor.lastrowid}")
     
     def update_task_status(self, task_id: int, new_status: str) -> None:
         """Update the status of a task"""
-        # Read all tasks
-        with open(self.tasks_csv, 'r', newline='') as file:
-            reader = csv.reader(file)
-            rows = list(reader)
-        
-        # Update the status of the specific task
-        updated = False
-        for row in rows[1:]:  # Skip header
-            if row[0] == str(task_id):
-                row[5] = new_status
-                if new_status == 'completed':
-                    # If marking as completed, update the rollover count
-                    row[8] = '0'
-                updated = True
-                break
+        # If marking as completed, reset the rollover count
+        with self.conn:
+            cursor = self.conn.execute(
+                """
+                UPDATE tasks
+                SET status = ?,
+                    rollover_count = CASE WHEN ? = 'completed' THEN 0 ELSE rollover_count END
+                WHERE task_id = ?
+                """,
+                (new_status, new_status, task_id)
+            )
         
-        if not updated:
+        if cursor.rowcount == 0:
             print(f"Task with ID {task_id} not found.")
             return
         
-        # Write back all tasks
-        with open(self.tasks_csv, 'w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerows(rows)
-        
         print(f"Task {task_id} status updated to '{new_status}'")
     
     def migrate_incomplete_tasks(self) -> None:
         """Migrate incomplete tasks to the next day"""
-        today = datetime.now().strftime('%Y-%m-%d')
-        
-        # Read all tasks
-        with open(self.tasks_csv, 'r', newline='') as file:
-            reader = csv.reader(file)
-            rows = list(reader)
-        
-        # Identify and update incomplete tasks
-        migrated_count = 0
-        for row in rows[1:]:  # Skip header
-            if row[5] == 'pending' and row[7] <= today:
-                # Increment rollover count
-                row[8] = str(int(row[8]) + 1)
-                
-                # Update due date to next day
-                due_date = datetime.strptime(row[7], '%Y-%m-%d')
-                new_due_date = due_date + timedelta(days=1)
-                row[7] = new_due_date.strftime('%Y-%m-%d')
-                
-                migrated_count += 1
+        today = _today()
         
-        # Write back all tasks
-        with open(self.tasks_csv, 'w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerows(rows)
+        # Bump rollover count and push due date by a day in one statement
+        with self.conn:
+            cursor = self.conn.execute(
+                """
+                UPDATE tasks
+                SET rollover_count = rollover_count + 1,
+                    due_date = date(due_date, '+1 day')
+                WHERE status = 'pending' AND due_date <= ?
+                """,
+                (today,)
+            )
+        migrated_count = cursor.rowcount
         
         # Record migration in progress log
         self._update_progress_log(migrated_tasks=migrated_count)
@@ -206,108 +263,107 @@ class PersonalPASystem:
     
     def _update_progress_log(self, migrated_tasks: int = 0) -> None:
         """Update the progress log with today's stats"""
-        today = datetime.now().strftime('%Y-%m-%d')
-        
-        # Get task stats using SQL query via the CSV tools
-        query = f"""
-        SELECT 
-            COUNT(*) FILTER (WHERE status = 'completed' AND due_date = '{today}') as completed,
-            COUNT(*) FILTER (WHERE status = 'pending' AND due_date = '{today}') as pending
-        FROM tasks
-        """
+        today = _today()
         
-        result = self.csv_tools.query_csv_file("tasks", query)
-        lines = result.strip().split('\n')
+        # Counts, score and log row come out of one statement; no Python arithmetic needed
+        row = self.conn.execute(
+            PROGRESS_ROW_SQL, {'today': today, 'migrated': migrated_tasks}
+        ).fetchone()
         
-        # Parse the query results
-        if len(lines) >= 2:
-            _, counts = lines
-            completed, pending = map(int, counts.split(','))
-            
-            # Calculate productivity score (simple version)
-            total = completed + pending
-            productivity_score = round((completed / total * 100) if total > 0 else 0, 2)
-            
-            # Add to progress log
-            with open(self.progress_csv, 'a', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow([
-                    today, completed, pending, 
-                    migrated_tasks, productivity_score, ''
-                ])
+        # Add to progress log
+        with open(self.progress_csv, 'a', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(row)
+    
+    def _query(self, query: str, params: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        """Run a parameterized DuckDB query and return the rows as dicts"""
+        cursor = self.duck.execute(query, params or [])
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
     
     def get_today_schedule(self) -> List[Dict[str, Any]]:
         """Get today's schedule with assigned tasks"""
-        today_name = datetime.now().strftime('%A')
+        today_name = _today_name()
         
         # Get schedule blocks for today
-        query = f"""
+        query = """
         SELECT block_id, start_time, end_time, block_name, block_type, task_ids
         FROM schedule
-        WHERE day = '{today_name}'
+        WHERE day = ?
         ORDER BY start_time
         """
         
-        schedule_result = self.csv_tools.query_csv_file("schedule", query)
-        schedule_lines = schedule_result.strip().split('\n')
-        
         schedule = []
-        if len(schedule_lines) > 1:  # More than just the header
-            headers = schedule_lines[0].split(',')
-            
-            for line in schedule_lines[1:]:
-                values = line.split(',')
-                block = dict(zip(headers, values))
+        for block in self._query(query, [today_name]):
+            # Get tasks assigned to this block
+            if block['task_ids']:
+                task_ids = [int(task_id) for task_id in block['task_ids'].split(';')]
+                placeholders = ', '.join('?' * len(task_ids))
+                tasks_query = f"""
+                SELECT task_id, title, priority, status
+                FROM tasks
+                WHERE task_id IN ({placeholders})
+                ORDER BY priority DESC
+                """
                 
-                # Get tasks assigned to this block
-                if block['task_ids']:
-                    task_ids = block['task_ids'].split(';')
-                    tasks_query = f"""
-                    SELECT task_id, title, priority, status
-                    FROM tasks
-                    WHERE task_id IN ({','.join(task_ids)})
-                    ORDER BY priority DESC
-                    """
-                    
-                    tasks_result = self.csv_tools.query_csv_file("tasks", query)
-                    tasks_lines = tasks_result.strip().split('\n')
-                    
-                    tasks = []
-                    if len(tasks_lines) > 1:
-                        task_headers = tasks_lines[0].split(',')
-                        for task_line in tasks_lines[1:]:
-                            task_values = task_line.split(',')
-                            tasks.append(dict(zip(task_headers, task_values)))
-                    
-                    block['tasks'] = tasks
-                else:
-                    block['tasks'] = []
-                
-                schedule.append(block)
+                cursor = self.conn.execute(tasks_query, task_ids)
+                task_headers = [column[0] for column in cursor.description]
+                block['tasks'] = [dict(zip(task_headers, row)) for row in cursor]
+            else:
+                block['tasks'] = []
+            
+            schedule.append(block)
         
         return schedule
     
+    def _read_progress_since(self, start_date: str) -> List[Dict[str, str]]:
+        """Read progress rows dated on or after start_date, scanning back from the end of the file"""
+        with open(self.progress_csv, 'rb') as file:
+            header = file.readline()
+            data_start = file.tell()
+            position = file.seek(0, os.SEEK_END)
+            data = b''
+            
+            # Pull in blocks from the end until the oldest complete line predates the window
+            while position > data_start:
+                step = min(PROGRESS_READ_BLOCK, position - data_start)
+                position -= step
+                file.seek(position)
+                data = file.read(step) + data
+                if position > data_start:
+                    lines = data.split(b'\n', 2)
+                    if len(lines) == 3 and lines[1].split(b',', 1)[0].decode() < start_date:
+                        break
+        
+        # Drop the partial first line when we stopped mid-file
+        if position > data_start:
+            data = data.split(b'\n', 1)[1]
+        
+        reader = csv.DictReader(io.StringIO((header + data).decode(), newline=''))
+        return [row for row in reader if row['date'] >= start_date]
+    
     def get_productivity_insights(self, days: int = 7) -> Dict[str, Any]:
         """Get productivity insights for the past days"""
         # Calculate date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        query = f"""
-        SELECT 
-            date, completed_tasks, pending_tasks, 
-            rolled_over_tasks, productivity_score
-        FROM progress
-        WHERE date BETWEEN '{start_date.strftime('%Y-%m-%d')}' AND '{end_date.strftime('%Y-%m-%d')}'
-        ORDER BY date
-        """
+        end_date = _today()
+        start_date = (date.fromisoformat(end_date) - timedelta(days=days)).isoformat()
         
-        result = self.csv_tools.query_csv_file("progress", query)
-        lines = result.strip().split('\n')
+        # progress.csv is append-only, so the window sits at the end of the file
+        rows = [
+            {
+                'date': row['date'],
+                'completed_tasks': row['completed_tasks'],
+                'pending_tasks': row['pending_tasks'],
+                'rolled_over_tasks': row['rolled_over_tasks'],
+                'productivity_score': row['productivity_score']
+            }
+            for row in self._read_progress_since(start_date)
+            if row['date'] <= end_date
+        ]
         
         # Process the results
         insights = {
-            'period': f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
+            'period': f"{start_date} to {end_date}",
             'data': [],
             'summary': {
                 'avg_productivity': 0,
@@ -317,16 +373,13 @@ class PersonalPASystem:
             }
         }
         
-        if len(lines) > 1:
-            headers = lines[0].split(',')
+        if rows:
             total_productivity = 0
             total_completed = 0
             total_pending = 0
             total_rolled = 0
             
-            for line in lines[1:]:
-                values = line.split(',')
-                data_point = dict(zip(headers, values))
+            for data_point in rows:
                 insights['data'].append(data_point)
                 
                 # Update summary counts
@@ -346,9 +399,38 @@ class PersonalPASystem:
         
         return insights
     
+    def get_data_summary(self) -> Dict[str, Any]:
+        """Get columns, row counts and status counts for each CSV"""
+        status_counts = dict(self.conn.execute(
+            "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+        ).fetchall())
+        schedule_count = self.duck.execute("SELECT COUNT(*) FROM schedule").fetchone()[0]
+        progress_count, last_logged = self.duck.execute(
+            "SELECT COUNT(*), MAX(date) FROM progress"
+        ).fetchone()
+        
+        return {
+            'tasks': {
+                'columns': TASK_COLUMNS,
+                'rowcount': sum(status_counts.values()),
+                'status_counts': status_counts
+            },
+            'schedule': {
+                'columns': [column[0] for column in self.duck.execute("DESCRIBE schedule").fetchall()],
+                'rowcount': schedule_count
+            },
+            'progress': {
+                'columns': [column[0] for column in self.duck.execute("DESCRIBE progress").fetchall()],
+                'rowcount': progress_count,
+                'last_logged': last_logged
+            }
+        }
+    
     def run_cli(self):
         """Run the system in CLI mode"""
-        self.agent.cli_app(stream=False)
+        self.export_tasks_csv()
+        self.agent.additional_context = f"Data summary: {json.dumps(self.get_data_summary())}"
+        self.agent.cli_app(stream=True)
 
 def main():
     pa_system = PersonalPASystem()
@@ -359,7 +441,7 @@ def main():
         description="Focus on dynamic programming problems", 
         category="DSA", 
         priority=1, 
-        due_date=datetime.now().strftime('%Y-%m-%d'),
+        due_date=_today(),
         time_block="Core Learning Sessions"
     )
     
@@ -368,7 +450,7 @@ def main():
         description="Focus on Random Forests and Decision Trees", 
         category="ML", 
         priority=2, 
-        due_date=datetime.now().strftime('%Y-%m-%d'),
+        due_date=_today(),
         time_block="Core Learning Sessions"
     )
     
@@ -377,7 +459,7 @@ def main():
         description="Focus on ML Engineer and Data Scientist roles", 
         category="Job Search", 
         priority=1, 
-        due_date=datetime.now().strftime('%Y-%m-%d'),
+        due_date=_today(),
         time_block="Job Search & Networking"
     )
     
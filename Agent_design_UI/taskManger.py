@@ -1,16 +1,19 @@
+import asyncio
 import csv
 import json
 import httpx
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from phi.agent import Agent
-from phi.model.groq import Groq
+from cached_groq import CachedGroq
 from phi.storage.agent.sqlite import SqlAgentStorage
 from phi.playground import Playground, serve_playground_app
 from phi.tools.csv_tools import CsvTools
 CSV_agent_Listener = Agent(
     name="csv Agent Listener",
-    model=Groq(id="llama-3.3-70b-versatile"),
+    # CsvTools can rewrite arbitrary files here, so there is nothing to key the cache on
+    model=CachedGroq(id="llama-3.3-70b-versatile", cache_responses=False),
     tools=[CsvTools()],
     instructions=["Always include user input and save changes in csv files"],
     storage=SqlAgentStorage(table_name="web_agent", db_file="agents.db"),
@@ -20,7 +23,7 @@ CSV_agent_Listener = Agent(
 
 CSV_agent_Reviewer = Agent(
     name="csv Agent reviewer",
-    model=Groq(id="llama-3.3-70b-versatile"),
+    model=CachedGroq(id="llama-3.3-70b-versatile", cache_responses=False),
     tools=[CsvTools()],
     instructions=["changes required save in csv files"],
     storage=SqlAgentStorage(table_name="web_agent", db_file="agents.db"),
@@ -30,5 +33,20 @@ CSV_agent_Reviewer = Agent(
 
 app = Playground(agents=[CSV_agent_Listener, CSV_agent_Reviewer]).get_app()
 
+async def ask_agents(prompt):
+    """Let the listener save the changes, then have the reviewer check them"""
+    # Run one after the other: the reviewer reads what the listener saved, and both
+    # agents write their sessions to the same web_agent table
+    listener = await CSV_agent_Listener.arun(prompt)
+    reviewer = await CSV_agent_Reviewer.arun(
+        f"{prompt}\n\nThe listener replied:\n{listener.content}\n\nReview the changes it saved."
+    )
+    return [listener.content, reviewer.content]
+
 if __name__ == "__main__":
-    serve_playground_app("playground:app", reload=True)
\ No newline at end of file
+    if len(sys.argv) > 1:
+        # One-shot mode: the listener answers first, then the reviewer checks its changes
+        for reply in asyncio.run(ask_agents(" ".join(sys.argv[1:]))):
+            print(reply)
+    else:
+        serve_playground_app("playground:app", reload=True)
\ No newline at end of file
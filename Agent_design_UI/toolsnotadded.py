@@ -1,113 +1,249 @@
+import asyncio
+import sys
 from phi.agent import Agent
-from phi.model.groq import Groq
+from cached_groq import CachedGroq
 from phi.storage.agent.sqlite import SqlAgentStorage
 from phi.tools.file import FileTools
 from phi.tools.calendar import GoogleCalendarTools
 from phi.tools.date_time import DateTimeTools
+from phi.tools import Toolkit
 from phi.playground import Playground, serve_playground_app
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
+# Column types for the tasks file, so an empty table still has a usable schema
+TASK_DTYPES = {
+    'task_id': 'int64[pyarrow]',
+    'name': 'string[pyarrow]',
+    'category': 'string[pyarrow]',
+    'priority': 'int64[pyarrow]',
+    'scheduled_date': 'string[pyarrow]',
+    'scheduled_time': 'string[pyarrow]',
+    'duration_mins': 'int64[pyarrow]',
+    'status': 'string[pyarrow]',
+    'completion_date': 'string[pyarrow]',
+    'notes': 'string[pyarrow]',
+    'rollover_count': 'int64[pyarrow]',
+}
+
 # Define custom tool for task management
-class TaskManagerTools:
-    def __init__(self, task_file="tasks.csv"):
+class TaskManagerTools(Toolkit):
+    def __init__(self, task_file="tasks.parquet"):
+        super().__init__(name="task_manager_tools")
         self.task_file = task_file
+        # In-memory copy of the tasks file, reloaded only when the file changes
+        self._df = None
+        self._mtime = None
+        # New rows are buffered here and concatenated onto the DataFrame in one go
+        self._pending_rows = []
+        # Agents share one instance, so serialize access to the cached DataFrame
+        self._lock = threading.RLock()
+        # Inside batch() writes only mark the cache dirty; it is flushed once on exit
+        self._batch_depth = 0
+        self._dirty = False
         if not os.path.exists(task_file):
-            # Create empty tasks file with columns
-            df = pd.DataFrame(columns=[
-                'task_id', 'name', 'category', 'priority', 'scheduled_date', 
-                'scheduled_time', 'duration_mins', 'status', 'completion_date', 
-                'notes', 'rollover_count'
-            ])
-            df.to_csv(task_file, index=False)
+            legacy_csv = os.path.splitext(task_file)[0] + ".csv"
+            if os.path.exists(legacy_csv):
+                # Carry over tasks from the old CSV store, typed up front so '09:00' stays a string
+                column_types = {
+                    column: pa.int64() if dtype == 'int64[pyarrow]' else pa.string()
+                    for column, dtype in TASK_DTYPES.items()
+                }
+                table = pa_csv.read_csv(
+                    legacy_csv, convert_options=pa_csv.ConvertOptions(column_types=column_types)
+                )
+                df = table.to_pandas(types_mapper=pd.ArrowDtype)
+            else:
+                # Create empty tasks file with columns
+                df = pd.DataFrame(columns=list(TASK_DTYPES)).astype(TASK_DTYPES)
+            self._write(df)
+        # Next task ID is kept in memory and reseeded on each reload, so adding a task never scans the table
+        self._next_id = 1
+        self._refresh()
+        self.register(self.export_tasks_csv)
+        self.register(self.list_all_tasks)
+        self.register(self.list_tasks_by_date)
+        self.register(self.list_pending_tasks)
+        self.register(self.add_task)
+        self.register(self.update_task_status)
+        self.register(self.rollover_incomplete_tasks)
+        self.register(self.generate_daily_report)
+
+    def __deepcopy__(self, memo):
+        # Agent.deep_copy() copies its tools; keep every copy on this one shared instance
+        return self
+
+    def _refresh(self):
+        """Re-read the tasks file if another writer changed it since we last looked"""
+        with self._lock:
+            mtime = os.stat(self.task_file).st_mtime
+            # Unflushed changes from a batch live only in memory, so they win
+            unflushed = self._dirty or self._pending_rows
+            if self._df is None or (mtime != self._mtime and not unflushed):
+                table = pq.read_table(self.task_file, memory_map=True)
+                self._df = table.to_pandas(types_mapper=pd.ArrowDtype)
+                self._mtime = mtime
+                # Never hand out an ID that is already on disk
+                if not self._df.empty:
+                    self._next_id = max(self._next_id, int(self._df['task_id'].max()) + 1)
+
+    def _load(self):
+        """Return the cached tasks DataFrame, re-reading the file only if it is stale"""
+        with self._lock:
+            self._refresh()
+            self._materialize()
+            return self._df
+
+    def _materialize(self):
+        """Append any buffered rows to the cached DataFrame"""
+        if self._pending_rows:
+            new_rows = pd.DataFrame(self._pending_rows, columns=list(TASK_DTYPES)).astype(TASK_DTYPES)
+            self._df = pd.concat([self._df, new_rows], ignore_index=True)
+            self._pending_rows.clear()
+
+    def _flush(self):
+        """Write the cached tasks DataFrame back to the tasks file"""
+        with self._lock:
+            if self._batch_depth:
+                self._dirty = True
+                return
+            self._materialize()
+            self._write(self._df)
+            self._mtime = os.stat(self.task_file).st_mtime
+            self._dirty = False
+
+    def _write(self, df):
+        """Write a tasks DataFrame to the Parquet file"""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table, self.task_file, compression="zstd")
+
+    @contextmanager
+    def batch(self):
+        """Keep every change made inside the block in memory and write the file once on exit"""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._dirty:
+                    self._flush()
+
+    def export_tasks_csv(self, csv_file="tasks.csv"):
+        """Export all tasks to a CSV file for viewing outside the agents"""
+        df = self._load()
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), csv_file)
+        return f"Exported {len(df)} tasks to {csv_file}"
 
     def list_all_tasks(self):
         """List all tasks in the system"""
-        df = pd.read_csv(self.task_file)
+        df = self._load()
         return df.to_dict(orient='records')
     
     def list_tasks_by_date(self, date_str):
         """List all tasks scheduled for a specific date"""
-        df = pd.read_csv(self.task_file)
+        df = self._load()
         filtered = df[df['scheduled_date'] == date_str]
         return filtered.to_dict(orient='records')
     
     def list_pending_tasks(self):
         """List all tasks with status 'pending' or 'in_progress'"""
-        df = pd.read_csv(self.task_file)
+        df = self._load()
         filtered = df[df['status'].isin(['pending', 'in_progress'])]
         return filtered.to_dict(orient='records')
     
     def add_task(self, name, category, priority, scheduled_date, scheduled_time, 
                  duration_mins, status="pending", notes=""):
         """Add a new task to the system"""
-        df = pd.read_csv(self.task_file)
+        try:
+            duration_mins = int(duration_mins)
+        except (TypeError, ValueError):
+            return f"Error: duration_mins must be a whole number of minutes, got {duration_mins!r}"
+        try:
+            priority = int(priority)
+        except (TypeError, ValueError):
+            return f"Error: priority must be a whole number, got {priority!r}"
         
-        # Generate new task ID
-        task_id = 1
-        if not df.empty:
-            task_id = df['task_id'].max() + 1
+        with self._lock:
+            # Pick up rows written by other instances before appending to them
+            self._refresh()
             
-        new_task = {
-            'task_id': task_id,
-            'name': name,
-            'category': category,
-            'priority': priority,
-            'scheduled_date': scheduled_date,
-            'scheduled_time': scheduled_time,
-            'duration_mins': duration_mins,
-            'status': status,
-            'completion_date': '',
-            'notes': notes,
-            'rollover_count': 0
-        }
+            # Generate new task ID
+            task_id = self._next_id
+            self._next_id += 1
+            
+            new_task = {
+                'task_id': task_id,
+                'name': name,
+                'category': category,
+                'priority': priority,
+                'scheduled_date': scheduled_date,
+                'scheduled_time': scheduled_time,
+                'duration_mins': duration_mins,
+                'status': status,
+                'completion_date': '',
+                'notes': notes,
+                'rollover_count': 0
+            }
         
-        df = pd.concat([df, pd.DataFrame([new_task])], ignore_index=True)
-        df.to_csv(self.task_file, index=False)
-        return f"Task added successfully with ID: {task_id}"
+            self._pending_rows.append(new_task)
+            self._flush()
+            return f"Task added successfully with ID: {task_id}"
     
     def update_task_status(self, task_id, status, notes=""):
         """Update the status of a task"""
-        df = pd.read_csv(self.task_file)
+        try:
+            task_id = int(task_id)
+        except (TypeError, ValueError):
+            return f"Error: Task ID must be a number, got {task_id!r}"
         
-        if task_id not in df['task_id'].values:
-            return f"Error: Task with ID {task_id} not found"
+        with self._lock:
+            df = self._load()
+        
+            matches = df.index[df['task_id'] == task_id]
+            if len(matches) == 0:
+                return f"Error: Task with ID {task_id} not found"
             
-        idx = df.index[df['task_id'] == task_id][0]
-        df.at[idx, 'status'] = status
+            idx = matches[0]
+            df.at[idx, 'status'] = status
         
-        if status == "completed":
-            df.at[idx, 'completion_date'] = datetime.now().strftime('%Y-%m-%d')
+            if status == "completed":
+                df.at[idx, 'completion_date'] = datetime.now().strftime('%Y-%m-%d')
             
-        if notes:
-            df.at[idx, 'notes'] = notes
+            if notes:
+                df.at[idx, 'notes'] = notes
             
-        df.to_csv(self.task_file, index=False)
-        return f"Task {task_id} updated to status: {status}"
+            self._flush()
+            return f"Task {task_id} updated to status: {status}"
     
     def rollover_incomplete_tasks(self, from_date, to_date):
         """Move incomplete tasks from one date to another"""
-        df = pd.read_csv(self.task_file)
+        with self._lock:
+            df = self._load()
         
-        # Find incomplete tasks for the specified date
-        incomplete = df[(df['scheduled_date'] == from_date) & 
-                        (df['status'].isin(['pending', 'in_progress']))]
+            # Find incomplete tasks for the specified date
+            incomplete = ((df['scheduled_date'] == from_date) & 
+                          (df['status'].isin(['pending', 'in_progress']))).fillna(False)
         
-        rollover_count = 0
-        for idx in incomplete.index:
-            # Increment rollover count
-            df.at[idx, 'rollover_count'] = df.at[idx, 'rollover_count'] + 1
-            df.at[idx, 'scheduled_date'] = to_date
-            df.at[idx, 'notes'] = df.at[idx, 'notes'] + f" | Rolled over from {from_date}"
-            rollover_count += 1
+            # Update every matching row in one vectorized pass
+            df.loc[incomplete, 'rollover_count'] += 1
+            df.loc[incomplete, 'scheduled_date'] = to_date
+            df.loc[incomplete, 'notes'] = df.loc[incomplete, 'notes'].fillna("") + f" | Rolled over from {from_date}"
+            rollover_count = int(incomplete.sum())
             
-        df.to_csv(self.task_file, index=False)
-        return f"Rolled over {rollover_count} tasks from {from_date} to {to_date}"
+            self._flush()
+            return f"Rolled over {rollover_count} tasks from {from_date} to {to_date}"
     
     def generate_daily_report(self, date_str):
         """Generate a summary report for a specific day"""
-        df = pd.read_csv(self.task_file)
+        df = self._load()
         day_tasks = df[df['scheduled_date'] == date_str]
         
         total_tasks = len(day_tasks)
@@ -141,12 +277,15 @@ class TaskManagerTools:
         
         return report
 
+# One task manager shared by every agent so they see the same cached tasks
+task_manager_tools = TaskManagerTools()
+
 # Create Task Scheduler Agent
 task_scheduler_agent = Agent(
     name="Task Scheduler PA",
-    model=Groq(id="llama-3.3-70b-versatile"),
+    model=CachedGroq(id="llama-3.3-70b-versatile", data_files=[task_manager_tools.task_file]),
     tools=[
-        TaskManagerTools(),
+        task_manager_tools,
         DateTimeTools(),
         FileTools()
     ],
@@ -167,9 +306,9 @@ task_scheduler_agent = Agent(
 # Create Progress Analytics Agent
 progress_analytics_agent = Agent(
     name="Progress Analytics PA",
-    model=Groq(id="llama-3.3-70b-versatile"),
+    model=CachedGroq(id="llama-3.3-70b-versatile", data_files=[task_manager_tools.task_file]),
     tools=[
-        TaskManagerTools(),
+        task_manager_tools,
         FileTools()
     ],
     instructions=[
@@ -190,10 +329,10 @@ progress_analytics_agent = Agent(
 # This would require setting up OAuth credentials
 calendar_agent = Agent(
     name="Calendar Integration PA",
-    model=Groq(id="llama-3.3-70b-versatile"),
+    model=CachedGroq(id="llama-3.3-70b-versatile", data_files=[task_manager_tools.task_file]),
     tools=[
         GoogleCalendarTools(), 
-        TaskManagerTools(),
+        task_manager_tools,
         DateTimeTools()
     ],
     instructions=[
@@ -215,5 +354,18 @@ app = Playground(agents=[
     calendar_agent
 ]).get_app()
 
+async def ask_agents(prompt, agents=None):
+    """Send the same prompt to several agents at once and collect their replies"""
+    agents = agents or [task_scheduler_agent, progress_analytics_agent]
+    # Coalesce all task writes made during this turn into a single flush
+    with task_manager_tools.batch():
+        responses = await asyncio.gather(*(agent.arun(prompt) for agent in agents))
+    return [response.content for response in responses]
+
 if __name__ == "__main__":
-    serve_playground_app("playground:app", reload=True)
\ No newline at end of file
+    if len(sys.argv) > 1:
+        # One-shot mode: fan the prompt out to the agents concurrently
+        for reply in asyncio.run(ask_agents(" ".join(sys.argv[1:]))):
+            print(reply)
+    else:
+        serve_playground_app("playground:app", reload=True)
\ No newline at end of file